@@ -97,5 +97,13 @@ async def main():
 
 
 if __name__ == "__main__":
+    # uvloop is a faster drop-in event loop; it is not available on Windows
+    try:
+        import uvloop
+
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
+
     exit_code = asyncio.run(main())
     sys.exit(exit_code)
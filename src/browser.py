@@ -10,6 +10,23 @@ from src.config import BrowserConfig
 
 logger = logging.getLogger(__name__)
 
+# Surgical manual evasions, kept compact since it is sent over CDP:
+# 1. Pass the webdriver test
+# 2. Mock plugins (Google checks this to ensure you aren't headless)
+# 3. Mock the Chrome runtime
+# 4. Pass the permissions test
+_STEALTH_JS = """
+Object.defineProperty(navigator, 'webdriver', { get: () => undefined });
+Object.defineProperty(navigator, 'plugins', { get: () => [1, 2, 3, 4, 5] });
+window.chrome = { runtime: {} };
+const originalQuery = window.navigator.permissions.query;
+window.navigator.permissions.query = (parameters) => (
+    parameters.name === 'notifications'
+        ? Promise.resolve({ state: 'denied' })
+        : originalQuery(parameters)
+);
+"""
+
 
 class BrowserManager:
     """Manages browser lifecycle with stealth configurations."""
@@ -39,7 +56,10 @@ class BrowserManager:
             "--start-maximized",
         ]
 
-        # Use persistent context to leverage existing login session
+        # Use persistent context to leverage existing login session.
+        # One context is shared by every worker page, and user_data_dir already
+        # keeps cookies, storage and Chrome's script code cache between runs,
+        # so no separate storage_state snapshot is needed for a warm start.
         self.context = await self.playwright.chromium.launch_persistent_context(
             user_data_dir=str(self.config.user_data_dir),
             executable_path=str(self.config.chrome_executable_path),
@@ -56,6 +76,11 @@ class BrowserManager:
             ],  # Removes "Chrome is being controlled..." banner
         )
 
+        # Apply Surgical Manual Evasions
+        # This overrides the JS property without breaking the Google App.
+        # Registered on the context so every worker page inherits it.
+        await self.context.add_init_script(_STEALTH_JS)
+
         logger.info(
             f"Browser context initialized with {len(self.context.pages)} existing pages"
         )
@@ -66,39 +91,10 @@ class BrowserManager:
         if not self.context:
             raise RuntimeError("Browser context not initialized")
 
+        # Stealth patches are installed once on the context in initialize()
         page = await self.context.new_page()
 
-        # REMOVE THIS LINE
-        # await stealth_async(page)
-
-        # Apply Surgical Manual Evasions
-        # This overrides the JS property without breaking the Google App
-        await page.add_init_script("""
-            // 1. Pass the Webdriver Test
-            Object.defineProperty(navigator, 'webdriver', {
-                get: () => undefined
-            });
-            
-            // 2. Mock Plugins (Google checks this to ensure you aren't headless)
-            Object.defineProperty(navigator, 'plugins', {
-                get: () => [1, 2, 3, 4, 5]
-            });
-            
-            // 3. Mock Chrome Runtime
-            window.chrome = {
-                runtime: {}
-            };
-            
-            // 4. Pass Permissions Test
-            const originalQuery = window.navigator.permissions.query;
-            window.navigator.permissions.query = (parameters) => (
-                parameters.name === 'notifications' ?
-                Promise.resolve({ state: 'denied' }) :
-                originalQuery(parameters)
-            );
-        """)
-
-        logger.debug("Created new stealth page with surgical CDP evasions")
+        logger.debug("Created new stealth page")
         return page
 
     async def close(self) -> None:
@@ -2,11 +2,25 @@
 Configuration Layer - Pydantic Models for Application Settings
 """
 
+import os
 from pathlib import Path
 from typing import Optional
 from pydantic import BaseModel, Field, field_validator
 
 
+def _env_ms(name: str, default: int) -> int:
+    """Read a millisecond setting from the environment, falling back to default."""
+    value = os.environ.get(name)
+    if not value:
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(
+            f"{name} must be a whole number of milliseconds, got {value!r}"
+        ) from None
+
+
 class BrowserConfig(BaseModel):
     """Browser configuration with persistent context settings."""
 
@@ -53,14 +67,59 @@ class ScraperConfig(BaseModel):
         default="Gemini 3 Pro Preview",
         description="AI model to select in the interface",
     )
+    model_id: Optional[str] = Field(
+        default=None,
+        description="Model id passed in the new-chat URL (e.g. gemini-3-pro-preview)",
+    )
     max_workers: int = Field(
         default=1, ge=1, le=10, description="Concurrent browser tabs"
     )
+    queue_batch_size: int = Field(
+        default=1,
+        ge=1,
+        description="Tasks a worker takes from the queue per wakeup",
+    )
     page_load_timeout: int = Field(default=60000, description="Page load timeout in ms")
     navigation_timeout: int = Field(
         default=30000, description="Navigation timeout in ms"
     )
 
+    # Element wait timeouts; override via environment on slow networks.
+    # validate_default applies the bounds to environment values as well.
+    label_probe_timeout: int = Field(
+        default_factory=lambda: _env_ms("SCRAPER_LABEL_PROBE_TIMEOUT", 3000),
+        validate_default=True,
+        ge=100,
+        description="Wait in ms for any candidate of a labelled control to appear",
+    )
+    state_probe_timeout: int = Field(
+        default_factory=lambda: _env_ms("SCRAPER_STATE_PROBE_TIMEOUT", 5000),
+        validate_default=True,
+        ge=100,
+        description="Wait in ms for toggles, the model picker and settle checks",
+    )
+    render_wait_timeout: int = Field(
+        default_factory=lambda: _env_ms("SCRAPER_RENDER_WAIT_TIMEOUT", 10000),
+        validate_default=True,
+        ge=100,
+        description="Wait in ms for the app shell and response content to render",
+    )
+    completion_wait_timeout: int = Field(
+        default_factory=lambda: _env_ms("SCRAPER_COMPLETION_WAIT_TIMEOUT", 120000),
+        validate_default=True,
+        ge=1000,
+        description="Wait in ms for a generation to finish",
+    )
+    net_idle_timeout: int = Field(
+        default=3000,
+        ge=0,
+        description="Cap in ms on waiting for network idle after navigating clicks (0 disables)",
+    )
+    block_heavy_resources: bool = Field(
+        default=True,
+        description="Have the browser drop image, font, media and analytics requests",
+    )
+
     # Human behavior simulation parameters
     typing_delay_min_ms: int = Field(default=50, ge=10)
     typing_delay_max_ms: int = Field(default=150, le=500)
@@ -70,6 +129,11 @@ class ScraperConfig(BaseModel):
     hover_duration_max_ms: int = Field(default=300, le=1000)
     action_delay_min_ms: int = Field(default=500, ge=100)
     action_delay_max_ms: int = Field(default=1500, le=5000)
+    paste_threshold: int = Field(
+        default=50,
+        ge=0,
+        description="Prompts at least this long are pasted instead of typed",
+    )
 
 
 class AppConfig(BaseModel):
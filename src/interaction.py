@@ -17,6 +17,8 @@ class HumanInteractionService:
 
     def __init__(self, config: ScraperConfig):
         self.config = config
+        # One mouse per page: keep concurrent move-hover-click sequences apart
+        self._mouse_lock = asyncio.Lock()
 
     def _random_delay(self, min_ms: int, max_ms: int) -> float:
         """Generate random delay in seconds."""
@@ -52,9 +54,9 @@ class HumanInteractionService:
             await asyncio.sleep(self._random_delay(100, 200))
 
         # 3. STRATEGY DECISION
-        # If text is short (< 50 chars), type it all to look human.
+        # If text is short (< paste_threshold chars), type it all to look human.
         # If text is long, use the 'Prefix + Paste' strategy.
-        if len(text) < 50:
+        if len(text) < self.config.paste_threshold:
             await self._type_character_by_character(page, text)
         else:
             await self._type_and_paste(page, locator, text)
@@ -120,6 +122,13 @@ class HumanInteractionService:
         # Wait for element to be visible and enabled
         await locator.wait_for(state="visible", timeout=10000)
 
+        async with self._mouse_lock:
+            await self._move_and_click(page, locator, hover_before)
+
+    async def _move_and_click(
+        self, page: Page, locator: Locator, hover_before: bool
+    ) -> None:
+        """Move to the element's center, optionally hover, then click."""
         # Get bounding box for mouse movement
         box = await locator.bounding_box()
         if not box:
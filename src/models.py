@@ -57,4 +57,9 @@ class WorkerStats(BaseModel):
     worker_id: int
     tasks_completed: int = 0
     tasks_failed: int = 0
-    total_processing_time: float = 0.0
+    total_processing_ns: int = 0
+
+    @property
+    def total_processing_time(self) -> float:
+        """Total processing time in seconds."""
+        return self.total_processing_ns / 1e9
@@ -4,8 +4,9 @@ Application Layer - Producer-Consumer Orchestration
 
 import asyncio
 import logging
+import time
 from asyncio import Queue
-from typing import List
+from typing import List, Optional
 
 from src.browser import BrowserManager
 from src.config import AppConfig
@@ -31,7 +32,9 @@ class ScraperOrchestrator:
         self.task_queue: Queue[PromptTask] = Queue()
         self.results: List[ScraperResult] = []
         self.worker_stats: List[WorkerStats] = []
-        self._shutdown = False
+
+        # Event to wake idle workers blocked on the queue when the session ends
+        self._stop = asyncio.Event()
 
         # Event to signal a forced user switch due to rate limits
         self._switch_user_event = asyncio.Event()
@@ -47,19 +50,46 @@ class ScraperOrchestrator:
             await self.task_queue.put(task)
         logger.info(f"Queue loaded with {self.task_queue.qsize()} tasks")
 
-    async def worker(self, worker_id: int, base_url: str) -> None:
+    async def _next_task(self) -> Optional[PromptTask]:
+        """
+        Wait for the next task, or return None once the stop event is set.
+        Racing the queue against the event avoids periodic timeout wakeups.
+        """
+        get_task = asyncio.create_task(self.task_queue.get())
+        stop_task = asyncio.create_task(self._stop.wait())
+
+        done, pending = await asyncio.wait(
+            {get_task, stop_task}, return_when=asyncio.FIRST_COMPLETED
+        )
+        for t in pending:
+            t.cancel()
+
+        if stop_task in done:
+            if get_task in done:
+                # Both fired together: hand the task back for the next session
+                self.task_queue.put_nowait(get_task.result())
+                self.task_queue.task_done()
+            return None
+
+        return get_task.result()
+
+    def _drain(self, limit: int) -> List[PromptTask]:
+        """Take up to `limit` already-queued tasks without waiting."""
+        items: List[PromptTask] = []
+        while len(items) < limit and not self.task_queue.empty():
+            items.append(self.task_queue.get_nowait())
+        return items
+
+    async def _setup(
+        self, worker_id: int, base_url: str
+    ) -> Optional[GoogleAIStudioScraper]:
         """
-        Consumer: Process tasks from the queue for a specific user session.
+        Open a stealth page and initialize a scraper for a specific user session.
+        Returns None if the page could not be prepared.
         """
         logger.info(f"Worker {worker_id}: Starting for {base_url}")
         page = None
 
-        # Find or create stats for this worker ID
-        stats = next((s for s in self.worker_stats if s.worker_id == worker_id), None)
-        if not stats:
-            stats = WorkerStats(worker_id=worker_id)
-            self.worker_stats.append(stats)
-
         try:
             page = await self.browser_manager.create_stealth_page()
 
@@ -68,82 +98,116 @@ class ScraperOrchestrator:
             )
             # Initialize with the specific User URL
             await scraper.initialize(url=base_url)
+            return scraper
 
-            while not self._shutdown and not self._switch_user_event.is_set():
+        except Exception as e:
+            logger.error(f"Worker {worker_id}: Setup failed: {e}", exc_info=True)
+            if page:
                 try:
-                    task = await asyncio.wait_for(self.task_queue.get(), timeout=1.0)
-                except asyncio.TimeoutError:
-                    if self.task_queue.empty():
-                        break
-                    continue
+                    await page.close()
+                except Exception:
+                    pass
+            return None
 
-                task.status = PromptStatus.PROCESSING
-                logger.info(f"Worker {worker_id}: Processing task {task.id}")
+    async def _consume(self, worker_id: int, scraper: GoogleAIStudioScraper) -> None:
+        """
+        Consumer: Process tasks from the queue with an initialized scraper.
+        """
+        # Find or create stats for this worker ID
+        stats = next((s for s in self.worker_stats if s.worker_id == worker_id), None)
+        if not stats:
+            stats = WorkerStats(worker_id=worker_id)
+            self.worker_stats.append(stats)
 
-                import time
+        batch_size = self.config.scraper.queue_batch_size
 
-                start_time = time.time()
+        # Bind hot-loop methods once; the queue is unbounded so put_nowait never raises
+        q_put = self.task_queue.put_nowait
+        q_done = self.task_queue.task_done
+        log_info = logger.info
+        log_warn = logger.warning
 
-                try:
-                    result = await scraper.process_prompt(task)
-
-                    processing_time = time.time() - start_time
-                    stats.total_processing_time += processing_time
-
-                    if result:
-                        task.status = PromptStatus.COMPLETED
-                        self.results.append(result)
-                        result_dict = {"key": result.key, "value": result.value}
-                        await self.saver.save(result_dict)
-                        stats.tasks_completed += 1
-                        logger.info(
-                            f"Worker {worker_id}: Completed & Saved task {task.id} in {processing_time:.2f}s"
-                        )
-                    else:
-                        # Standard failure (not rate limit)
-                        if task.can_retry():
-                            task.increment_retry()
-                            task.status = PromptStatus.PENDING
-                            await self.task_queue.put(task)
-                            logger.warning(
-                                f"Worker {worker_id}: Task {task.id} failed, requeued"
+        try:
+            while not self._stop.is_set() and not self._switch_user_event.is_set():
+                first = await self._next_task()
+                if first is None:
+                    break
+
+                batch = [first]
+                batch.extend(self._drain(batch_size - 1))
+
+                for task in batch:
+                    if self._stop.is_set() or self._switch_user_event.is_set():
+                        # Hand back drained tasks this session will not process
+                        q_put(task)
+                        q_done()
+                        continue
+
+                    task.status = PromptStatus.PROCESSING
+                    log_info(f"Worker {worker_id}: Processing task {task.id}")
+
+                    start_ns = time.perf_counter_ns()
+
+                    try:
+                        result = await scraper.process_prompt(task)
+
+                        processing_ns = time.perf_counter_ns() - start_ns
+                        stats.total_processing_ns += processing_ns
+                        processing_time = processing_ns / 1e9
+
+                        if result:
+                            task.status = PromptStatus.COMPLETED
+                            self.results.append(result)
+                            result_dict = {"key": result.key, "value": result.value}
+                            await self.saver.save(result_dict)
+                            stats.tasks_completed += 1
+                            log_info(
+                                f"Worker {worker_id}: Completed & Saved task {task.id} in {processing_time:.2f}s"
                             )
                         else:
-                            task.status = PromptStatus.FAILED
-                            stats.tasks_failed += 1
-                            logger.error(
-                                f"Worker {worker_id}: Task {task.id} failed permanently"
-                            )
+                            # Standard failure (not rate limit)
+                            if task.can_retry():
+                                task.increment_retry()
+                                task.status = PromptStatus.PENDING
+                                q_put(task)
+                                log_warn(
+                                    f"Worker {worker_id}: Task {task.id} failed, requeued"
+                                )
+                            else:
+                                task.status = PromptStatus.FAILED
+                                stats.tasks_failed += 1
+                                logger.error(
+                                    f"Worker {worker_id}: Task {task.id} failed permanently"
+                                )
+
+                    except RateLimitDetected:
+                        log_warn(
+                            f"Worker {worker_id}: RATE LIMIT DETECTED for task {task.id}"
+                        )
 
-                except RateLimitDetected:
-                    logger.warning(
-                        f"Worker {worker_id}: RATE LIMIT DETECTED for task {task.id}"
-                    )
+                        # 1. Put the task back in the queue to be processed by next user
+                        task.status = PromptStatus.PENDING
+                        q_put(task)
 
-                    # 1. Put the task back in the queue to be processed by next user
-                    task.status = PromptStatus.PENDING
-                    await self.task_queue.put(task)
+                        # 2. Signal orchestration to switch user
+                        self._switch_user_event.set()
 
-                    # 2. Signal orchestration to switch user
-                    self._switch_user_event.set()
+                        # 3. Mark the 'get()' as done so we don't block logic
+                        q_done()
+                        continue
 
-                    # 3. Mark the 'get()' as done so we don't block logic
-                    self.task_queue.task_done()
-                    break
-
-                self.task_queue.task_done()
-                await asyncio.sleep(1)
+                    q_done()
+                    await asyncio.sleep(1)
 
         except Exception as e:
             logger.error(f"Worker {worker_id}: Fatal error: {e}", exc_info=True)
 
         finally:
             logger.info(f"Worker {worker_id}: Shutting down (closing page).")
-            if page:
-                try:
-                    await page.close()
-                except Exception:
-                    pass
+            try:
+                await scraper.page.close()
+            except Exception:
+                pass
 
     async def run(self, prompts: List[dict]) -> List[ScraperResult]:
         """
@@ -171,18 +235,32 @@ class ScraperOrchestrator:
                 logger.info(f"{'=' * 60}\n")
 
                 # Reset Control Flags
-                self._shutdown = False
+                self._stop.clear()
                 self._switch_user_event.clear()
 
+                # One page per worker, all driven concurrently in the shared
+                # context; never open more pages than there are tasks to run
                 num_workers = min(
-                    self.config.scraper.max_workers,
-                    self.task_queue.qsize() + 5,  # Buffer
+                    self.config.scraper.max_workers, self.task_queue.qsize()
                 )
 
+                # Prepare all worker pages concurrently so slow navigations overlap
+                scrapers = await asyncio.gather(
+                    *(self._setup(i, current_url) for i in range(num_workers))
+                )
+
+                if not any(scrapers):
+                    logger.error(
+                        "No worker could be initialized for this user. Skipping..."
+                    )
+                    current_url_index += 1
+                    continue
+
                 # Start Workers with CURRENT URL
                 workers = [
-                    asyncio.create_task(self.worker(i, current_url))
-                    for i in range(num_workers)
+                    asyncio.create_task(self._consume(i, scraper))
+                    for i, scraper in enumerate(scrapers)
+                    if scraper
                 ]
 
                 # Wait Logic: Wait for EITHER (Queue Empty) OR (Rate Limit Signal)
@@ -199,7 +277,7 @@ class ScraperOrchestrator:
                     logger.warning(
                         "Rate Limit Signal received. Stopping current workers..."
                     )
-                    self._shutdown = True  # Tell workers to stop naturally
+                    self._stop.set()  # Tell workers to stop naturally
 
                     # Cancel the queue waiter since we are interrupting
                     if not queue_join_task.done():
@@ -214,7 +292,7 @@ class ScraperOrchestrator:
                 else:
                     # Queue is empty, job done
                     logger.info("All tasks completed for this session.")
-                    self._shutdown = True
+                    self._stop.set()
                     if not switch_signal_task.done():
                         switch_signal_task.cancel()
                     await asyncio.gather(*workers, return_exceptions=True)
@@ -228,7 +306,7 @@ class ScraperOrchestrator:
             # Log final statistics
             total_completed = sum(s.tasks_completed for s in self.worker_stats)
             total_failed = sum(s.tasks_failed for s in self.worker_stats)
-            total_time = sum(s.total_processing_time for s in self.worker_stats)
+            total_time = sum(s.total_processing_ns for s in self.worker_stats) / 1e9
 
             logger.info(
                 f"Orchestration complete. "
@@ -239,4 +317,5 @@ class ScraperOrchestrator:
             return self.results
 
         finally:
+            self.saver.close()
             await self.browser_manager.close()
@@ -3,11 +3,13 @@ Service Layer - Google AI Studio Scraper Implementation
 """
 
 import asyncio
+import json
 import logging
 from ast import Return
-from typing import Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from urllib.parse import quote, urljoin
 
-from playwright.async_api import Page
+from playwright.async_api import CDPSession, Locator, Page
 from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 
 from src.config import ScraperConfig
@@ -16,6 +18,205 @@ from src.models import PromptTask, RateLimitDetected, ScraperResult
 
 logger = logging.getLogger(__name__)
 
+# Text of the banner AI Studio shows when an account hits its quota
+_RATE_LIMIT_TEXT = "reached your rate limit"
+
+# Accessible names the "Chat with models" entry point and prompt box have used
+_CHAT_LINK_NAMES = ("Chat with models", "Chat with model", "Start chat", "New chat")
+_INPUT_LABELS = ("Enter a prompt", "Enter prompt", "Type a message", "Message", "Prompt")
+
+# Requests the scraper never reads (images, fonts, media, analytics); blocking
+# them speeds up every navigation. Wildcard patterns for Network.setBlockedURLs.
+_BLOCKED_URL_PATTERNS = (
+    "*.png*",
+    "*.jpg*",
+    "*.jpeg*",
+    "*.gif*",
+    "*.webp*",
+    "*.ico*",
+    "*.woff*",
+    "*.ttf*",
+    "*.mp4*",
+    "*.webm*",
+    "*fonts.gstatic.com*",
+    "*lh3.googleusercontent.com*",
+    "*google-analytics*",
+    "*googletagmanager*",
+    "*doubleclick*",
+)
+
+# Sets window.__rateLimited once the rate-limit message is added to the DOM.
+# Only inspects added nodes, so streaming responses stay cheap to observe.
+_RATE_LIMIT_OBSERVER_JS = (
+    """
+(() => {
+    const needle = """
+    + json.dumps(_RATE_LIMIT_TEXT)
+    + """;
+    const hit = node => (node.textContent || '').includes(needle);
+    window.__rateLimited = false;
+    const start = () => {
+        new MutationObserver(records => {
+            if (window.__rateLimited) return;
+            for (const record of records) {
+                const found = record.type === 'characterData'
+                    ? hit(record.target)
+                    : Array.prototype.some.call(record.addedNodes, hit);
+                if (found) {
+                    window.__rateLimited = true;
+                    return;
+                }
+            }
+        }).observe(document.documentElement, {
+            childList: true,
+            subtree: true,
+            characterData: true,
+        });
+    };
+    if (document.documentElement) start();
+    else document.addEventListener('readystatechange', start, { once: true });
+})();
+"""
+)
+
+# True once the Run button has entered its streaming (Stop) state and left it.
+# window.__sawGeneration is reset before each submit.
+_GENERATION_DONE_JS = """
+() => {
+    const busy = !!document.querySelector('button.stoppable');
+    if (busy) window.__sawGeneration = true;
+    return window.__sawGeneration === true && !busy;
+}
+"""
+
+# Feedback control shown under a finished model turn
+_FEEDBACK_BUTTON_SELECTOR = "button[aria-label='Good response']"
+
+# Clears the generation flag and counts model turns and feedback buttons before
+# a prompt is sent
+_ARM_SUBMIT_JS = f"""
+() => {{
+    window.__sawGeneration = false;
+    return {{
+        turns: document.querySelectorAll('div[data-turn-role="Model"]').length,
+        feedback: document.querySelectorAll("{_FEEDBACK_BUTTON_SELECTOR}").length,
+    }};
+}}
+"""
+
+# Short look in ms at a remembered locator before probing every candidate
+_CACHED_PROBE_MS = 500
+
+# Poll interval in ms for checks that run throughout a streaming generation
+_STREAM_POLL_MS = 500
+
+# True while no response is streaming
+_NOT_STREAMING_JS = "() => !document.querySelector('button.stoppable')"
+
+_RUN_BUTTON_SELECTOR = "button[aria-label='Run']"
+_TEMP_TOGGLE_SELECTOR = "button[aria-label='Temporary chat toggle']"
+
+# Visibility, enabled state, classes and text of one element; null when absent
+_ELEMENT_STATE_JS = """
+selector => {
+    const el = document.querySelector(selector);
+    if (!el) return null;
+    return {
+        visible: !!(el.offsetWidth || el.offsetHeight || el.getClientRects().length),
+        disabled: !!el.disabled,
+        classes: Array.from(el.classList),
+        text: el.innerText,
+    };
+}
+"""
+
+# Cheap identity of a freshly reset chat page: path plus size of the main region
+_PAGE_FINGERPRINT_JS = """
+() => location.pathname + '|' + (document.querySelector('main')?.innerHTML.length || 0)
+"""
+
+# Scrolls the last model turn and every scrollable ancestor to the bottom
+_SCROLL_TO_LATEST_JS = """
+() => {
+    const turns = document.querySelectorAll('div[data-turn-role="Model"]');
+    const last = turns[turns.length - 1];
+    if (last) {
+        last.scrollIntoView({ block: 'end' });
+        for (let el = last.parentElement; el; el = el.parentElement) {
+            if (el.scrollHeight > el.clientHeight) el.scrollTop = el.scrollHeight;
+        }
+        // Virtualized lists often render on wheel events rather than scrollTop
+        last.dispatchEvent(new WheelEvent('wheel', { deltaY: 5000, bubbles: true }));
+    }
+    const root = document.scrollingElement;
+    if (root) root.scrollTop = root.scrollHeight;
+}
+"""
+
+# Snapshot of the last model turn: turn count, container presence and text
+_RESPONSE_STATE_JS = (
+    """
+() => {
+    const all = document.querySelectorAll('div[data-turn-role="Model"]');
+    const turns = all.length;
+    const container = turns ? all[turns - 1].querySelector('.turn-content') : null;
+    const text = container ? container.innerText.trim() : '';
+    return {
+        turns,
+        hasContainer: !!container,
+        rateLimited: text.includes("""
+    + json.dumps(_RATE_LIMIT_TEXT)
+    + """),
+        text,
+    };
+}
+"""
+)
+
+# Resolves with the snapshot once a turn newer than `before` has text to read.
+# Returns a Promise that a MutationObserver settles, so the check re-runs only
+# when the DOM changes; the timeout only releases the observer, since Playwright
+# enforces its own.
+_AWAIT_RESPONSE_JS = f"""
+({{ timeout, before }}) => new Promise(resolve => {{
+    const read = () => {{
+        const state = ({_RESPONSE_STATE_JS})();
+        return state.turns > before && state.text ? state : null;
+    }};
+    const first = read();
+    if (first) return resolve(first);
+    const observer = new MutationObserver(() => {{
+        const state = read();
+        if (!state) return;
+        observer.disconnect();
+        clearTimeout(timer);
+        resolve(state);
+    }});
+    const timer = setTimeout(() => observer.disconnect(), timeout);
+    observer.observe(document.body, {{
+        childList: true,
+        subtree: true,
+        characterData: true,
+    }});
+}})
+"""
+
+# Completion and extraction in one wait: resolves with the response text once
+# a turn newer than `before` has rendered text and its feedback buttons are
+# shown. Earlier turns keep their own buttons, so a button only counts if it
+# sits in the newest turn or adds to the `feedback` count taken before submit.
+_RESPONSE_READY_JS = f"""
+({{ before, feedback }}) => {{
+    const state = ({_RESPONSE_STATE_JS})();
+    if (state.turns <= before || !state.text || state.rateLimited) return false;
+    const all = document.querySelectorAll('div[data-turn-role="Model"]');
+    const done =
+        all[all.length - 1].querySelector("{_FEEDBACK_BUTTON_SELECTOR}") ||
+        document.querySelectorAll("{_FEEDBACK_BUTTON_SELECTOR}").length > feedback;
+    return done ? state.text : false;
+}}
+"""
+
 
 class GoogleAIStudioScraper:
     """Orchestrates the scraping workflow for Google AI Studio."""
@@ -26,6 +227,47 @@ class GoogleAIStudioScraper:
         self.worker_id = worker_id
         self.interaction = HumanInteractionService(config)
 
+        # Locators are lazy and page-bound, so build the hot ones once per worker
+        self._home_locator = page.locator(
+            "span.material-symbols-outlined:text-is('home')"
+        ).first
+        self._run_button = page.locator(_RUN_BUTTON_SELECTOR).first
+        self._temp_toggle = page.locator(_TEMP_TOGGLE_SELECTOR)
+        self._rate_limit_notice = page.locator(f"text={_RATE_LIMIT_TEXT}")
+
+        # Candidate locators for controls whose label varies between UI versions
+        self._chat_link_candidates: List[Locator] = []
+        for name in _CHAT_LINK_NAMES:
+            self._chat_link_candidates.append(page.get_by_role("link", name=name))
+            self._chat_link_candidates.append(page.get_by_role("button", name=name))
+        # Any content-editable region is the last resort for the prompt box
+        self._input_candidates = [
+            page.get_by_role("textbox", name=label) for label in _INPUT_LABELS
+        ]
+        self._input_candidates.append(page.locator('[contenteditable="true"]'))
+
+        # The model never changes for a worker, so its locators are fixed too
+        self._model_button = page.get_by_role("button", name=config.model_name)
+        self._model_text = page.get_by_text(config.model_name, exact=False)
+
+        # Which candidate locator matched for each probed control
+        self._locator_cache: Dict[str, Locator] = {}
+
+        # Session state that survives chat resets; cleared when a task fails
+        self._model_selected = False
+        self._temp_mode_active = False
+
+        # Page fingerprint taken while the page is known to be a fresh chat
+        self._reset_fingerprint: Optional[str] = None
+
+        # Model turns and feedback buttons on the page before the current
+        # prompt was sent
+        self._turns_before_submit = 0
+        self._feedback_before_submit = 0
+
+        # CDP session that holds the request block list for this page
+        self._cdp_session: Optional[CDPSession] = None
+
     async def initialize(self, url: Optional[str] = None) -> None:
         """Navigate to Google AI Studio and prepare the page."""
         target_url = url or self.config.base_url[0]
@@ -33,95 +275,307 @@ class GoogleAIStudioScraper:
             f"Worker {self.worker_id}: Initializing Google AI Studio at {target_url}"
         )
 
+        self._invalidate_session_state()
+
+        # A model id in the new-chat URL selects the model without any clicks
+        if self.config.model_id:
+            # urljoin replaces the last path segment unless it ends with '/'
+            base = target_url if target_url.endswith("/") else target_url + "/"
+            target_url = (
+                urljoin(base, "prompts/new_chat")
+                + f"?model={quote(self.config.model_id)}"
+            )
+
+        # Flags the rate-limit banner from inside the page as soon as it renders
+        await self.page.add_init_script(_RATE_LIMIT_OBSERVER_JS)
+
+        if self.config.block_heavy_resources and self._cdp_session is None:
+            await self._block_heavy_requests()
+
         # Set timeouts
         self.page.set_default_timeout(self.config.page_load_timeout)
         self.page.set_default_navigation_timeout(self.config.navigation_timeout)
 
-        # Navigate to target URL
-        await self.page.goto(target_url, wait_until="domcontentloaded")
-        await asyncio.sleep(2)  # Allow page to fully render
+        # Navigate to target URL and continue as soon as the app shell is usable
+        await self.page.goto(target_url, wait_until="commit")
+        shell_ready = True
+        try:
+            await self._home_locator.wait_for(
+                state="visible", timeout=self.config.navigation_timeout
+            )
+        except PlaywrightTimeoutError:
+            shell_ready = False
+            logger.warning(
+                f"Worker {self.worker_id}: Home navigation did not appear after load"
+            )
+
+        if self.config.model_id:
+            await self._confirm_url_model()
+            # The new-chat URL opens a fresh chat, so the first task's reset
+            # can be skipped while the page is still unchanged
+            if shell_ready:
+                self._reset_fingerprint = await self._page_fingerprint()
 
-    async def reset_chat_context(self) -> None:
+    async def _confirm_url_model(self) -> None:
+        """One-time probe: trust the URL model selection only if the UI shows it."""
+        try:
+            await self._model_text.first.wait_for(
+                state="visible", timeout=self.config.state_probe_timeout
+            )
+            self._model_selected = True
+            logger.debug(
+                f"Worker {self.worker_id}: Model preselected via URL: {self.config.model_id}"
+            )
+        except PlaywrightTimeoutError:
+            logger.info(
+                f"Worker {self.worker_id}: URL model selection not confirmed, "
+                f"falling back to the model picker"
+            )
+
+    async def _block_heavy_requests(self) -> None:
         """
-        Reset to a fresh chat session:
-        1. Click "Home" in left navbar
-        2. Ensure "Chat prompt" mode
-        3. Click "Chat with models"
+        Have the browser itself drop images, fonts, media and analytics beacons.
+        Unlike page.route, this keeps the HTTP cache and needs no Python hop per request.
         """
-        logger.debug(f"Worker {self.worker_id}: Resetting chat context")
-
-        # Click Home button in navigation
         try:
-            await self.page.wait_for_selector(
-                "//span[contains(@class, 'material-symbols-outlined') and normalize-space()='home']",
-                timeout=10000,
+            session = await self.page.context.new_cdp_session(self.page)
+            await session.send("Network.enable")
+            await session.send(
+                "Network.setBlockedURLs", {"urls": list(_BLOCKED_URL_PATTERNS)}
             )
-            home_button = self.page.locator(
-                "//span[contains(@class, 'material-symbols-outlined') and normalize-space()='home']"
+            self._cdp_session = session
+        except Exception as e:
+            logger.warning(
+                f"Worker {self.worker_id}: Could not block heavy resources: {e}"
             )
-            await self.interaction.safe_click(self.page, home_button)
-        except Exception:
-            # Fallback: sometimes navigating directly to home helps if UI is stuck
-            await self.page.goto(self.page.url, wait_until="domcontentloaded")
 
-        await self.interaction.random_action_delay()
+    async def _element_state(self, selector: str) -> Optional[Dict[str, Any]]:
+        """Read an element's visibility, enabled state, classes and text in one call."""
+        return await self.page.evaluate(_ELEMENT_STATE_JS, selector)
 
-        # Wait for page to load
-        await asyncio.sleep(1)
+    def _invalidate_session_state(self) -> None:
+        """Force model and temporary mode to be re-applied on the next task."""
+        self._model_selected = False
+        self._temp_mode_active = False
+        self._reset_fingerprint = None
 
-        # Look for "Chat with models" button or link
-        chat_link = None
-        possible_names = [
-            "Chat with models",
-            "Chat with model",
-            "Start chat",
-            "New chat",
-        ]
+    async def _settle_after_click(self) -> None:
+        """
+        Wait out the human-like pause while the network goes quiet.
+        The app keeps long-lived connections open, so the idle wait is capped.
+        """
+        async def network_idle() -> None:
+            if self.config.net_idle_timeout:
+                try:
+                    await self.page.wait_for_load_state(
+                        "networkidle", timeout=self.config.net_idle_timeout
+                    )
+                except PlaywrightTimeoutError:
+                    pass
+
+        await asyncio.gather(self.interaction.random_action_delay(), network_idle())
+
+    async def _page_fingerprint(self) -> str:
+        return await self.page.evaluate(_PAGE_FINGERPRINT_JS)
+
+    async def _is_rate_limited(self) -> bool:
+        """Check for the rate-limit message without serializing the whole DOM."""
+        return await self._rate_limit_notice.count() > 0
+
+    async def _first_completed(self, waits: List[Awaitable]) -> Optional[int]:
+        """
+        Race several waits concurrently and cancel the losers.
+
+        Args:
+            waits: Awaitables in order of preference
+
+        Returns:
+            Index of the first wait to finish without error, or None if all failed
+        """
+        waiters = [asyncio.ensure_future(w) for w in waits]
+        pending = set(waiters)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                # A wait that errors out for any reason other than its timeout
+                # is a broken signal, not a slow one; make it visible
+                for waiter in done:
+                    error = waiter.exception()
+                    if error is not None and not isinstance(
+                        error, PlaywrightTimeoutError
+                    ):
+                        logger.warning(
+                            f"Worker {self.worker_id}: Wait failed: {error!r}"
+                        )
+                # Prefer earlier waits when several resolve together
+                for idx, waiter in enumerate(waiters):
+                    if waiter in done and waiter.exception() is None:
+                        return idx
+            return None
+        finally:
+            for waiter in pending:
+                waiter.cancel()
 
-        for name in possible_names:
+    async def _adaptive_wait(
+        self, predicate: Callable[[], Awaitable[bool]], timeout: int
+    ) -> bool:
+        """
+        Poll a predicate with a doubling interval (1s up to 60s).
+
+        Args:
+            predicate: Async check that returns True once the condition holds
+            timeout: Total budget in milliseconds; one final check runs at the end
+
+        Returns:
+            True if the predicate held before the budget ran out
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout / 1000
+        interval = 1.0
+        while True:
+            if await predicate():
+                return True
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return False
+            await asyncio.sleep(min(interval, remaining))
+            interval = min(interval * 2, 60.0)
+
+    async def _generation_idle(self) -> bool:
+        return await self.page.evaluate(_NOT_STREAMING_JS)
+
+    @staticmethod
+    def _any_of(candidates: List[Locator]) -> Locator:
+        """Combine candidate locators into one that resolves to the first match."""
+        combined = candidates[0]
+        for candidate in candidates[1:]:
+            combined = combined.or_(candidate)
+        return combined.first
+
+    async def _resolve(
+        self, key: str, candidates: List[Locator], timeout: int
+    ) -> Optional[Locator]:
+        """
+        Wait for the first visible candidate and remember which one matched.
+
+        Later calls for the same key first take a short look at the remembered
+        locator; if it does not show up, the entry is invalidated and all
+        candidates are probed within the rest of the budget.
+
+        Args:
+            key: Logical name of the control being resolved
+            candidates: Locators in order of preference
+            timeout: Total timeout in milliseconds
+
+        Returns:
+            The matching locator, or None if no candidate became visible
+        """
+        cached = self._locator_cache.get(key)
+        if cached is not None:
+            probe = min(_CACHED_PROBE_MS, timeout)
             try:
-                chat_link = self.page.get_by_role("link", name=name)
-                await chat_link.wait_for(state="visible", timeout=3000)
-                break
+                await cached.wait_for(state="visible", timeout=probe)
+                return cached
             except PlaywrightTimeoutError:
-                try:
-                    chat_link = self.page.get_by_role("button", name=name)
-                    await chat_link.wait_for(state="visible", timeout=3000)
-                    break
-                except PlaywrightTimeoutError:
-                    continue
+                logger.debug(f"Worker {self.worker_id}: Cached '{key}' went stale")
+                del self._locator_cache[key]
+                # The candidate search below still finds it if it renders late
+                timeout = max(timeout - probe, 1)
+
+        combined = self._any_of(candidates)
+        try:
+            await combined.wait_for(state="visible", timeout=timeout)
+        except PlaywrightTimeoutError:
+            return None
+
+        # One-off scan so later tasks only query the candidate that matched
+        for candidate in candidates:
+            if await candidate.first.is_visible():
+                self._locator_cache[key] = candidate.first
+                return candidate.first
+        return combined
+
+    async def reset_chat_context(self) -> None:
+        """
+        Reset to a fresh chat session:
+        1. Click "Home" in left navbar, unless a new-chat control is already shown
+        2. Ensure "Chat prompt" mode
+        3. Click "Chat with models"
+        """
+        if self._reset_fingerprint is not None:
+            if await self._page_fingerprint() == self._reset_fingerprint:
+                logger.debug(
+                    f"Worker {self.worker_id}: Already on a fresh chat, skipping reset"
+                )
+                return
+            self._reset_fingerprint = None
+
+        logger.debug(f"Worker {self.worker_id}: Resetting chat context")
+
+        # A new-chat control already on screen saves the Home round trip and
+        # the shell re-render it triggers
+        if not await self._any_of(self._chat_link_candidates).is_visible():
+            await self._go_home()
+
+        # Look for "Chat with models" button or link
+        chat_link = await self._resolve(
+            "chat_link",
+            self._chat_link_candidates,
+            timeout=self.config.label_probe_timeout,
+        )
 
         if chat_link:
             await self.interaction.safe_click(self.page, chat_link)
-            await self.interaction.random_action_delay()
+            await self._settle_after_click()
         else:
             logger.warning(
                 f"Worker {self.worker_id}: Could not find 'Chat with models' button"
             )
 
+    async def _go_home(self) -> None:
+        """Click Home in the left navbar, reloading the page if the UI is stuck."""
+        try:
+            await self._home_locator.wait_for(
+                state="visible", timeout=self.config.render_wait_timeout
+            )
+            await self.interaction.safe_click(self.page, self._home_locator)
+        except Exception:
+            # Fallback: sometimes navigating directly to home helps if UI is stuck
+            await self.page.goto(self.page.url, wait_until="domcontentloaded")
+            # The reloaded app shell renders after DOMContentLoaded; wait for it
+            # so the chat-link probe that follows is not spent on a blank page
+            try:
+                await self._home_locator.wait_for(
+                    state="visible", timeout=self.config.render_wait_timeout
+                )
+            except PlaywrightTimeoutError:
+                logger.warning(
+                    f"Worker {self.worker_id}: App shell did not render after reload"
+                )
+
+        await self._settle_after_click()
+
     async def select_model(self) -> None:
         """Select the specified model (e.g., "Gemini 3 Pro Preview")."""
         logger.debug(
             f"Worker {self.worker_id}: Selecting model: {self.config.model_name}"
         )
-        await asyncio.sleep(1)
 
-        try:
-            # Try as button first
-            model_button = self.page.get_by_role(
-                "button", name=self.config.model_name
-            ).first
-            await model_button.wait_for(state="visible", timeout=5000)
-            await self.interaction.safe_click(self.page, model_button)
-        except PlaywrightTimeoutError:
-            try:
-                model_text = self.page.get_by_text(self.config.model_name, exact=False)
-                await model_text.first.wait_for(state="visible", timeout=5000)
-                await self.interaction.safe_click(self.page, model_text.first)
-            except PlaywrightTimeoutError:
-                logger.warning(
-                    f"Worker {self.worker_id}: Could not find model: {self.config.model_name}"
-                )
+        # Button or plain text, whichever renders
+        model_option = await self._resolve(
+            "model_option",
+            [self._model_button, self._model_text],
+            timeout=self.config.state_probe_timeout,
+        )
+        if model_option:
+            await self.interaction.safe_click(self.page, model_option)
+            self._model_selected = True
+        else:
+            logger.warning(
+                f"Worker {self.worker_id}: Could not find model: {self.config.model_name}"
+            )
 
         await self.interaction.random_action_delay()
 
@@ -129,13 +583,17 @@ class GoogleAIStudioScraper:
         """Ensure the chat is in temporary mode (incognito)."""
         logger.debug(f"Worker {self.worker_id}: Checking temporary mode status")
         try:
-            toggle_button = self.page.locator(
-                "button[aria-label='Temporary chat toggle']"
-            )
-            await toggle_button.wait_for(state="visible", timeout=5000)
-            class_attr = await toggle_button.get_attribute("class")
+            toggle_button = self._temp_toggle
+
+            # Presence and classes in one evaluation; wait only if not rendered
+            state = await self._element_state(_TEMP_TOGGLE_SELECTOR)
+            if state is None:
+                await toggle_button.wait_for(
+                    state="visible", timeout=self.config.state_probe_timeout
+                )
+                state = await self._element_state(_TEMP_TOGGLE_SELECTOR)
 
-            if class_attr and "ms-button-active" in class_attr:
+            if state and "ms-button-active" in state["classes"]:
                 logger.debug(
                     f"Worker {self.worker_id}: Temporary mode is already active"
                 )
@@ -143,6 +601,7 @@ class GoogleAIStudioScraper:
                 logger.info(f"Worker {self.worker_id}: Enabling temporary mode")
                 await self.interaction.safe_click(self.page, toggle_button)
                 await self.interaction.random_action_delay()
+            self._temp_mode_active = True
         except Exception as e:
             logger.warning(
                 f"Worker {self.worker_id}: Failed to toggle temporary mode: {e}"
@@ -151,58 +610,106 @@ class GoogleAIStudioScraper:
     async def input_prompt(self, prompt: str) -> None:
         """Type the prompt into the content-editable input area."""
         logger.debug(f"Worker {self.worker_id}: Inputting prompt")
-        input_area = None
-        possible_labels = [
-            "Enter a prompt",
-            "Enter prompt",
-            "Type a message",
-            "Message",
-            "Prompt",
-        ]
-
-        for label in possible_labels:
-            try:
-                input_area = self.page.get_by_role("textbox", name=label)
-                await input_area.wait_for(state="visible", timeout=3000)
-                break
-            except PlaywrightTimeoutError:
-                continue
+        input_area = await self._resolve(
+            "input_area",
+            self._input_candidates,
+            timeout=self.config.label_probe_timeout,
+        )
 
         if not input_area:
-            try:
-                input_area = self.page.locator('[contenteditable="true"]').first
-                await input_area.wait_for(state="visible", timeout=3000)
-            except PlaywrightTimeoutError:
-                raise RuntimeError(
-                    f"Worker {self.worker_id}: Could not find input area"
-                )
+            raise RuntimeError(f"Worker {self.worker_id}: Could not find input area")
 
         await self.interaction.human_type(
             self.page, input_area, prompt, clear_first=True
         )
         await self.interaction.random_action_delay()
 
-    async def submit_and_wait(self) -> None:
+    async def submit_and_wait(self) -> Optional[str]:
+        """
+        Submit the prompt and wait for generation to finish.
+
+        Returns:
+            The response text when completion and rendered text were observed
+            together, or None if it still has to be extracted
+        """
         logger.debug(f"Worker {self.worker_id}: Submitting prompt")
-        run_button = self.page.locator("//button[@aria-label='Run']").first
-        await self.interaction.safe_click(self.page, run_button)
+        # Turns already on the page belong to earlier prompts; extraction
+        # only accepts a newer one
+        counts = await self.page.evaluate(_ARM_SUBMIT_JS)
+        self._turns_before_submit = counts["turns"]
+        self._feedback_before_submit = counts["feedback"]
+        await self.interaction.safe_click(self.page, self._run_button)
+        # The chat is no longer fresh once a prompt has been sent
+        self._reset_fingerprint = None
         logger.debug(f"Worker {self.worker_id}: Waiting for generation to complete")
-        try:
-            completion_signal = self.page.locator(
-                "button[aria-label='Good response']"
-            ).last
-            await completion_signal.wait_for(state="visible", timeout=120000)
+
+        # Race every completion signal, and the in-page rate-limit flag, in one
+        # wait: whichever fires first ends it
+        timeout = self.config.completion_wait_timeout
+        # The page mutates constantly while streaming, so every check runs on a
+        # fixed interval rather than once per animation frame
+        response_ready = asyncio.ensure_future(
+            self.page.wait_for_function(
+                _RESPONSE_READY_JS,
+                arg={
+                    "before": self._turns_before_submit,
+                    "feedback": self._feedback_before_submit,
+                },
+                polling=_STREAM_POLL_MS,
+                timeout=timeout,
+            )
+        )
+        signal = await self._first_completed(
+            [
+                self.page.wait_for_function(
+                    "() => window.__rateLimited === true",
+                    polling=_STREAM_POLL_MS,
+                    timeout=timeout,
+                ),
+                response_ready,
+                # A stream shorter than one interval can pass unseen here; the
+                # response-ready wait above still covers that case
+                self.page.wait_for_function(
+                    _GENERATION_DONE_JS, polling=_STREAM_POLL_MS, timeout=timeout
+                ),
+            ]
+        )
+        if signal == 0:
+            raise RateLimitDetected("Rate limit detected during wait")
+        if signal is None:
+            run_state = await self._element_state(_RUN_BUTTON_SELECTOR)
+            logger.warning(
+                f"Worker {self.worker_id}: Timeout waiting for completion signal "
+                f"(Run button state: {run_state})"
+            )
+            # Long generations: keep checking, ever less often, before giving up
+            if await self._adaptive_wait(self._generation_idle, timeout):
+                logger.debug(f"Worker {self.worker_id}: Generation finished late")
+            else:
+                logger.warning(
+                    f"Worker {self.worker_id}: Generation still running after fallback wait"
+                )
+        elif signal == 1:
             logger.debug(
                 f"Worker {self.worker_id}: Generation completed (Feedback button detected)"
             )
-        except Exception as e:
-            logger.warning(
-                f"Worker {self.worker_id}: Timeout or error waiting for completion signal: {e}"
+            # The same wait already captured the text; no extraction pass needed
+            return await response_ready.result().json_value()
+        else:
+            logger.debug(
+                f"Worker {self.worker_id}: Generation completed (Stop button cleared)"
             )
-        await asyncio.sleep(5)
-        content = await self.page.content()
-        if content and "reached your rate limit" in content:
+
+        # Wait for the streaming state to clear rather than sleeping a fixed 5s
+        try:
+            await self.page.wait_for_function(
+                _NOT_STREAMING_JS, timeout=self.config.state_probe_timeout
+            )
+        except PlaywrightTimeoutError:
+            pass
+        if await self._is_rate_limited():
             raise RateLimitDetected("Rate limit detected during wait")
+        return None
 
     async def scroll_to_latest_response(self) -> None:
         """
@@ -213,33 +720,9 @@ class GoogleAIStudioScraper:
         logger.debug(f"Worker {self.worker_id}: Scrolling to reveal latest response")
 
         try:
-            # Strategy 1: Find the last model turn and explicitly scroll it into view
-            model_turns = self.page.locator('div[data-turn-role="Model"]')
-            count = await model_turns.count()
-
-            if count > 0:
-                last_turn = model_turns.last
-
-                # 1. Standard scroll into view
-                await last_turn.scroll_into_view_if_needed()
-
-                # 2. Mouse Wheel Scroll (Stronger trigger for virtual lists)
-                # We move the mouse over the element and scroll down
-                box = await last_turn.bounding_box()
-                if box:
-                    # Center mouse on the response
-                    await self.page.mouse.move(
-                        box["x"] + box["width"] / 2, box["y"] + box["height"] / 2
-                    )
-                    # Scroll down significantly to ensure bottom is hit
-                    await self.page.mouse.wheel(0, 5000)
-
-            # Strategy 2: Keyboard 'End' Press (Backup)
-            # This is often the most reliable way to scroll a chat container to the absolute bottom
-            await self.page.keyboard.press("End")
-
-            # Allow time for the DOM to update/render after the scroll
-            await asyncio.sleep(1.0)
+            # Scroll the last turn and its scroll container in a single evaluation
+            # rather than separate count/bbox/mouse/keyboard round-trips
+            await self.page.evaluate(_SCROLL_TO_LATEST_JS)
 
         except Exception as e:
             # Log warning but don't fail the task; extraction might still succeed
@@ -252,54 +735,60 @@ class GoogleAIStudioScraper:
         logger.debug(f"Worker {self.worker_id}: Extracting response")
 
         try:
-            await asyncio.sleep(1)
-            model_turns = self.page.locator('div[data-turn-role="Model"]')
+            # Generation has finished by now, so the text is usually already in
+            # the DOM: read it in one evaluation and only fall back to waiting
+            data = await self.page.evaluate(_RESPONSE_STATE_JS)
+            before = self._turns_before_submit
+            fresh = data["turns"] > before
+            if (
+                data["turns"]
+                and not (fresh and data["text"])
+                and not data["rateLimited"]
+            ):
+                # Settled by an in-page MutationObserver, so there is no poll loop
+                timeout = self.config.render_wait_timeout
+                try:
+                    handle = await self.page.wait_for_function(
+                        _AWAIT_RESPONSE_JS,
+                        arg={"timeout": timeout, "before": before},
+                        timeout=timeout,
+                    )
+                    data = await handle.json_value()
+                except PlaywrightTimeoutError:
+                    data = await self.page.evaluate(_RESPONSE_STATE_JS)
 
-            if await model_turns.count() == 0:
+            if data["turns"] <= before:
                 # Check for rate limit before giving up
-                content = await self.page.content()
-                if "reached your rate limit" in content:
+                if await self._is_rate_limited():
                     raise RateLimitDetected("Rate limit detected (no model turns)")
-                logger.warning(f"Worker {self.worker_id}: No model turns found")
-                return None
-
-            last_turn = model_turns.last
-            content_container = last_turn.locator(".turn-content")
-
-            try:
-                await content_container.wait_for(state="attached", timeout=10000)
-            except Exception:
+                # An older turn would hold the previous prompt's answer
                 logger.warning(
-                    f"Worker {self.worker_id}: Content container never appeared"
+                    f"Worker {self.worker_id}: No model turn found for this prompt"
                 )
                 return None
 
-            # POLLING LOOP
-            for _ in range(20):
-                response_text = await content_container.inner_text()
-
-                # Check explicitly for Rate Limit message within the response text
-                if "reached your rate limit" in response_text:
-                    raise RateLimitDetected(
-                        "Rate limit message detected in response text"
-                    )
-
-                if response_text and len(response_text.strip()) > 0:
-                    clean_text = response_text.strip()
-                    logger.debug(
-                        f"Worker {self.worker_id}: Extracted {len(clean_text)} chars"
-                    )
-                    return clean_text
+            # Check explicitly for Rate Limit message within the response text
+            if data["rateLimited"]:
+                raise RateLimitDetected("Rate limit message detected in response text")
 
-                await asyncio.sleep(0.5)
+            if data["text"]:
+                logger.debug(
+                    f"Worker {self.worker_id}: Extracted {len(data['text'])} chars"
+                )
+                return data["text"]
 
             # Check full page content one last time if extraction failed
-            if "reached your rate limit" in await self.page.content():
+            if await self._is_rate_limited():
                 raise RateLimitDetected("Rate limit detected in page content")
 
-            logger.warning(
-                f"Worker {self.worker_id}: Content container found but text remained empty"
-            )
+            if not data["hasContainer"]:
+                logger.warning(
+                    f"Worker {self.worker_id}: Content container never appeared"
+                )
+            else:
+                logger.warning(
+                    f"Worker {self.worker_id}: Content container found but text remained empty"
+                )
             return None
 
         except RateLimitDetected:
@@ -313,13 +802,39 @@ class GoogleAIStudioScraper:
         try:
             logger.info(f"Worker {self.worker_id}: Processing task {task.id}")
             await self.reset_chat_context()
-            await self.temporary_mode()
-            await self.select_model()
+
+            # Model and temporary mode persist across chats in the same session.
+            # They live in separate parts of the UI, so their waits can overlap.
+            setup_steps = []
+            if not self._temp_mode_active:
+                setup_steps.append(self.temporary_mode())
+            if not self._model_selected:
+                setup_steps.append(self.select_model())
+            if setup_steps:
+                # Resolve the prompt box meanwhile so input_prompt finds it cached
+                setup_steps.append(
+                    self._resolve(
+                        "input_area",
+                        self._input_candidates,
+                        timeout=self.config.label_probe_timeout,
+                    )
+                )
+            for outcome in await asyncio.gather(*setup_steps, return_exceptions=True):
+                if isinstance(outcome, Exception):
+                    logger.warning(
+                        f"Worker {self.worker_id}: Session setup step failed: {outcome}"
+                    )
+
             await self.input_prompt(task.prompt)
-            await self.submit_and_wait()
-            await self.scroll_to_latest_response()
+            response = await self.submit_and_wait()
 
-            response = await self.extract_response()
+            if response is None:
+                # Scrolling triggers the render that extraction waits on, so overlap them
+                scroll_task = asyncio.create_task(self.scroll_to_latest_response())
+                try:
+                    response = await self.extract_response()
+                finally:
+                    await scroll_task
 
             if response:
                 result = ScraperResult(key=task.id, value=response)
@@ -331,6 +846,7 @@ class GoogleAIStudioScraper:
                 logger.error(
                     f"Worker {self.worker_id}: Failed to extract response for task {task.id}"
                 )
+                self._invalidate_session_state()
                 return None
 
         except RateLimitDetected as e:
@@ -340,4 +856,5 @@ class GoogleAIStudioScraper:
             logger.error(
                 f"Worker {self.worker_id}: Error processing task {task.id}: {e}"
             )
+            self._invalidate_session_state()
             return None
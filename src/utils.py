@@ -5,15 +5,100 @@ Utility Functions - Helper methods for common operations
 import json
 import logging
 import asyncio
+import gzip
+import mmap
 import os
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Dict, Any, Set
+from typing import List, Dict, Any, Set, Optional, BinaryIO, Callable
 from datetime import datetime
-import aiofiles
+
+try:
+    import orjson
+except ImportError:  # Optional speedup; fall back to the stdlib
+    orjson = None
+
+try:
+    import simdjson
+except ImportError:  # Optional; only speeds up reading existing results
+    simdjson = None
+
+try:
+    import zstandard
+except ImportError:  # Optional; only needed for zstd-compressed exports
+    zstandard = None
 
 logger = logging.getLogger(__name__)
 
 
+def _json_dumps(
+    data: Any, pretty: bool = False, default: Optional[Callable[[Any], Any]] = None
+) -> bytes:
+    """
+    Serialize to UTF-8 JSON bytes, using orjson when it is available.
+    `default` converts objects the encoder does not know, as in json.dumps.
+    """
+    if orjson is not None:
+        option = orjson.OPT_INDENT_2 if pretty else 0
+        return orjson.dumps(data, default=default, option=option)
+    indent = 2 if pretty else None
+    return json.dumps(
+        data, indent=indent, ensure_ascii=False, default=default
+    ).encode("utf-8")
+
+
+# File suffix for each supported export compression
+_COMPRESSION_SUFFIXES = {"gzip": ".gz", "zstd": ".zst"}
+
+
+def _compress(payload: bytes, method: str) -> bytes:
+    """Compress bytes with gzip or zstd."""
+    if method == "gzip":
+        return gzip.compress(payload, compresslevel=6)
+    if method == "zstd":
+        if zstandard is None:
+            raise RuntimeError("zstd compression requires the 'zstandard' package")
+        return zstandard.ZstdCompressor(level=3, threads=-1).compress(payload)
+    raise ValueError(f"Unsupported compression: {method}")
+
+
+def _decompress_for(filepath: Path, content: bytes) -> bytes:
+    """Undo the compression implied by a .gz or .zst suffix, if any."""
+    if filepath.suffix == ".gz":
+        return gzip.decompress(content)
+    if filepath.suffix == ".zst":
+        if zstandard is None:
+            raise RuntimeError("Reading .zst files requires the 'zstandard' package")
+        return zstandard.ZstdDecompressor().decompress(content)
+    return content
+
+
+def _result_to_dict(result: Any) -> Dict[str, Any]:
+    """JSON form of a ScraperResult."""
+    return {"key": result.key, "value": result.value}
+
+
+def _json_loads(content: bytes) -> Any:
+    """Parse JSON bytes, using orjson when it is available."""
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+# Batches smaller than this are serialized and written on the event loop thread
+_INLINE_WRITE_LIMIT = 64 * 1024
+
+
+def _approx_size(items: List[Dict[str, Any]]) -> int:
+    """Rough serialized size of result entries, counted from their string values."""
+    return sum(
+        len(value)
+        for item in items
+        for value in item.values()
+        if isinstance(value, str)
+    )
+
+
 class IncrementalJSONSaver:
     """
     Manages thread-safe, incremental saving of JSON entries to a file.
@@ -24,6 +109,14 @@ class IncrementalJSONSaver:
         self.filepath = filepath
         self.lock = asyncio.Lock()
 
+        # Output handle and offset of the closing ']'; set on the first save
+        self._fh: Optional[BinaryIO] = None
+        self._close_pos = -1
+        self._has_entries = False
+
+        # Entries waiting for the next write
+        self._pending: List[Dict[str, Any]] = []
+
         # Ensure directory exists
         self.filepath.parent.mkdir(parents=True, exist_ok=True)
 
@@ -42,22 +135,14 @@ class IncrementalJSONSaver:
 
         try:
             # We read synchronously here as this happens once during startup
-            with open(self.filepath, "r", encoding="utf-8") as f:
+            with open(self.filepath, "rb") as f:
                 content = f.read().strip()
                 if not content:
                     return set()
 
-                data = json.loads(content)
-                if isinstance(data, list):
-                    # Extract 'key' from each result entry
-                    return {
-                        item.get("key")
-                        for item in data
-                        if isinstance(item, dict) and "key" in item
-                    }
-                return set()
-
-        except json.JSONDecodeError:
+                return self._keys_from_content(content)
+
+        except ValueError:
             logger.warning(
                 f"⚠️ Could not parse existing results in {self.filepath}. Resuming might re-process some tasks."
             )
@@ -66,76 +151,170 @@ class IncrementalJSONSaver:
             logger.error(f"Error reading existing results: {e}")
             return set()
 
+    @staticmethod
+    def _keys_from_content(content: bytes) -> Set[str]:
+        """
+        Extract the 'key' of every result entry in a JSON array.
+        With simdjson only the key fields are turned into Python objects.
+        """
+        if simdjson is not None:
+            data = simdjson.Parser().parse(content)
+            if isinstance(data, simdjson.Array):
+                return {
+                    item["key"]
+                    for item in data
+                    if isinstance(item, simdjson.Object) and "key" in item
+                }
+            return set()
+
+        data = _json_loads(content)
+        if isinstance(data, list):
+            # Extract 'key' from each result entry
+            return {
+                item.get("key")
+                for item in data
+                if isinstance(item, dict) and "key" in item
+            }
+        return set()
+
     async def save(self, data: Dict[str, Any]) -> None:
         """Async wrapper for the sync save operation."""
-        async with self.lock:
-            loop = asyncio.get_running_loop()
-            await loop.run_in_executor(None, self._save_sync, data)
+        await self.save_many([data])
+
+    async def save_many(self, items: List[Dict[str, Any]]) -> None:
+        """
+        Append several entries with a single write.
+
+        Entries queued by concurrent callers while another write holds the
+        lock are coalesced into the next write.
+        """
+        self._pending.extend(items)
 
-    def _save_sync(self, data: Dict[str, Any]) -> None:
+        async with self.lock:
+            if not self._pending:
+                return  # Already written by the previous lock holder
+
+            batch, self._pending = self._pending, []
+            try:
+                if _approx_size(batch) < _INLINE_WRITE_LIMIT:
+                    # Serializing and a small seek+write are cheaper than a
+                    # thread-pool round trip
+                    self._write_batch(batch)
+                else:
+                    loop = asyncio.get_running_loop()
+                    await loop.run_in_executor(None, self._write_batch, batch)
+            except OSError as e:
+                # The file was rolled back, so retry these entries with the
+                # next save (or close) rather than failing the caller, who
+                # might otherwise save them a second time
+                self._pending[:0] = batch
+                logger.error(
+                    f"Failed to save {len(batch)} result(s), will retry: {e}"
+                )
+
+    def _write_batch(self, batch: List[Dict[str, Any]]) -> None:
+        """Serialize entries straight to UTF-8 bytes and append them in one write."""
+        self._save_sync(b",\n".join(_json_dumps(data, pretty=True) for data in batch))
+
+    def _open_tail(self) -> None:
+        """
+        Open the file for the saver's lifetime and locate the closing ']'.
+        Sets _close_pos to -1 when no bracket is found (empty/corrupt file).
+        """
+        # Unbuffered, so a failed write never leaves bytes behind in a buffer
+        f = open(self.filepath, "rb+", buffering=0)
+        end_pos = os.fstat(f.fileno()).st_size
+        pos = -1
+        needs_comma = True
+
+        if end_pos:
+            # Scan the mapped tail in C rather than one read() per byte
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                # Search backwards for ']' (look back 2KB)
+                pos = mm.rfind(b"]", max(0, end_pos - 2048))
+                if pos != -1:
+                    # The array is empty if only whitespace follows the
+                    # last '[' (a '[' inside an entry leaves text behind)
+                    open_pos = mm.rfind(b"[", 0, pos)
+                    needs_comma = bool(mm[open_pos + 1 : pos].strip())
+
+        self._fh = f
+        self._close_pos = pos
+        self._has_entries = needs_comma
+
+    def _save_sync(self, entry_bytes: bytes) -> None:
         """
         Synchronous logic to append JSON to a file array.
-        Uses binary mode for precise seeking.
+        Uses binary mode for precise seeking; the file stays open and the
+        offset of the closing ']' is remembered, so no save rescans the file.
         """
-        try:
-            with open(self.filepath, "rb+") as f:
-                f.seek(0, 2)  # Seek to end
-                end_pos = f.tell()
-
-                # Search backwards for ']'
-                pos = end_pos
-                found_bracket = False
-                search_limit = min(end_pos, 2048)  # Look back 2KB
-
-                for i in range(1, search_limit + 1):
-                    pos = end_pos - i
-                    f.seek(pos)
-                    char = f.read(1)
-                    if char == b"]":
-                        found_bracket = True
-                        break
-
-                if not found_bracket:
-                    # Fallback for empty/corrupt files
-                    f.seek(0, 2)
-                    f.write(
-                        b",\n"
-                        + json.dumps(data, ensure_ascii=False).encode("utf-8")
-                        + b"]"
-                    )
-                    return
-
-                # Check if we need a comma (if array is not empty)
-                needs_comma = True
-                scan_pos = pos - 1
-                while scan_pos >= 0:
-                    f.seek(scan_pos)
-                    prev_char = f.read(1)
-                    if prev_char.isspace():
-                        scan_pos -= 1
-                        continue
-                    if prev_char == b"[":
-                        needs_comma = False
-                    break
+        if self._fh is None:
+            self._open_tail()
+        f = self._fh
 
-                # Overwrite ']' and add new entry
-                f.seek(pos)
-                entry_json = json.dumps(data, ensure_ascii=False, indent=2)
-                entry_bytes = entry_json.encode("utf-8")
+        # Offset and bytes that restore the file if this write fails
+        if self._close_pos == -1:
+            restore_at, restore = f.seek(0, 2), b""
+        else:
+            restore_at, restore = self._close_pos, b"]"
 
-                if needs_comma:
-                    f.write(b",\n" + entry_bytes + b"\n]")
+        try:
+            if self._close_pos == -1:
+                # Fallback for empty/corrupt files
+                self._write_all(b",\n" + entry_bytes + b"]")
+            else:
+                # Overwrite ']' and add new entry
+                f.seek(self._close_pos)
+                if self._has_entries:
+                    self._write_all(b",\n" + entry_bytes + b"\n]")
                 else:
-                    f.write(b"\n" + entry_bytes + b"\n]")
+                    self._write_all(b"\n" + entry_bytes + b"\n]")
+                # Drop anything that trailed the old ']'
+                f.truncate()
+
+            # Writes are unbuffered, so the bytes are already with the OS
+            self._close_pos = f.tell() - 1
+            self._has_entries = True
 
         except Exception as e:
             logger.error(f"Failed to save incremental result: {e}")
+            self._rollback(restore_at, restore)
             raise
 
+    def _write_all(self, data: bytes) -> None:
+        """Write every byte; raw file writes may be partial."""
+        view = memoryview(data)
+        while view:
+            view = view[self._fh.write(view) :]
 
-# Helper functions aliases
-async def load_prompts_from_json(filepath: str) -> List[Dict[str, str]]:
-    return await PromptLoader.from_json_file(Path(filepath))
+    def _rollback(self, offset: int, tail: bytes) -> None:
+        """Cut a failed write back to the last good offset and restore the tail."""
+        try:
+            self._fh.seek(offset)
+            self._fh.truncate()
+            self._write_all(tail)
+        except Exception as e:
+            logger.error(f"Could not roll back {self.filepath}: {e}")
+            # Rescan from disk on the next save
+            self._release()
+
+    def close(self) -> None:
+        """Write any queued entries, then release the output file handle."""
+        if self._pending:
+            batch, self._pending = self._pending, []
+            try:
+                self._write_batch(batch)
+            except Exception as e:
+                logger.error(
+                    f"Could not write {len(batch)} queued result(s) on close: {e}"
+                )
+        self._release()
+
+    def _release(self) -> None:
+        """Close the output file handle, if one is open."""
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
 
 
 class PromptLoader:
@@ -149,9 +328,8 @@ class PromptLoader:
         if not filepath.exists():
             raise FileNotFoundError(f"Prompts file not found at: {filepath}")
 
-        async with aiofiles.open(filepath, "r", encoding="utf-8") as f:
-            content = await f.read()
-            prompts = json.loads(content)
+        content = await asyncio.to_thread(filepath.read_bytes)
+        prompts = _json_loads(_decompress_for(filepath, content))
 
         logger.info(f"Loaded {len(prompts)} prompts from {filepath}")
         return prompts
@@ -169,12 +347,13 @@ class PromptLoader:
         """
         logger.info(f"Loading prompts from {filepath}")
 
+        content = await asyncio.to_thread(filepath.read_text, encoding="utf-8")
+
         prompts = []
-        async with aiofiles.open(filepath, "r", encoding="utf-8") as f:
-            async for i, line in enumerate(f):
-                line = line.strip()
-                if line:  # Skip empty lines
-                    prompts.append({"id": f"prompt_{i + 1:03d}", "prompt": line})
+        for i, line in enumerate(content.splitlines()):
+            line = line.strip()
+            if line:  # Skip empty lines
+                prompts.append({"id": f"prompt_{i + 1:03d}", "prompt": line})
 
         logger.info(f"Loaded {len(prompts)} prompts from {filepath}")
         return prompts
@@ -200,7 +379,12 @@ class ResultExporter:
     """Utility class for exporting results to various formats."""
 
     @staticmethod
-    async def to_json(results: List[Any], filepath: Path, pretty: bool = True) -> None:
+    async def to_json(
+        results: List[Any],
+        filepath: Path,
+        pretty: bool = True,
+        compress: Optional[str] = None,
+    ) -> None:
         """
         Export results to JSON file.
 
@@ -208,23 +392,26 @@ class ResultExporter:
             results: List of ScraperResult objects
             filepath: Output file path
             pretty: Whether to format with indentation
+            compress: "gzip" or "zstd" to compress the file; the matching
+                suffix (.gz or .zst) is appended to filepath
         """
-        logger.info(f"Exporting {len(results)} results to {filepath}")
+        if compress is not None:
+            if compress not in _COMPRESSION_SUFFIXES:
+                raise ValueError(f"Unsupported compression: {compress}")
+            filepath = filepath.with_name(
+                filepath.name + _COMPRESSION_SUFFIXES[compress]
+            )
 
-        # Convert to JSON-serializable format
-        data = [
-            {
-                "key": r.key,
-                "value": r.value,
-            }
-            for r in results
-        ]
+        logger.info(f"Exporting {len(results)} results to {filepath}")
 
-        indent = 2 if pretty else None
-        json_str = json.dumps(data, indent=indent, ensure_ascii=False)
+        def write() -> None:
+            payload = _json_dumps(results, pretty, default=_result_to_dict)
+            if compress is not None:
+                payload = _compress(payload, compress)
+            filepath.write_bytes(payload)
 
-        async with aiofiles.open(filepath, "w", encoding="utf-8") as f:
-            await f.write(json_str)
+        # Off the event loop so a large export does not stall scraping
+        await asyncio.to_thread(write)
 
         logger.info(f"Results exported to {filepath}")
 
@@ -239,27 +426,40 @@ class ResultExporter:
         """
         logger.info(f"Exporting {len(results)} results to {filepath}")
 
-        async with aiofiles.open(filepath, "w", encoding="utf-8") as f:
-            # Write header
-            await f.write("# Google AI Studio Scraper Results\n\n")
-            await f.write(f"Generated: {datetime.now().isoformat()}\n\n")
-            await f.write(f"Total Results: {len(results)}\n\n")
-            await f.write("---\n\n")
-
-            # Write each result
-            for i, r in enumerate(results, 1):
-                await f.write(f"## Result {i}: {r.key}\n\n")
-                await f.write(f"**Response:**\n\n")
-                await f.write(f"{r.value}\n\n")
-                await f.write("---\n\n")
+        await asyncio.to_thread(
+            lambda: filepath.write_text(
+                ResultExporter._render_markdown(results), encoding="utf-8"
+            )
+        )
 
         logger.info(f"Results exported to {filepath}")
 
+    @staticmethod
+    def _render_markdown(results: List[Any]) -> str:
+        """Render results as a single Markdown document."""
+        # Header
+        parts = [
+            "# Google AI Studio Scraper Results\n\n",
+            f"Generated: {datetime.now().isoformat()}\n\n",
+            f"Total Results: {len(results)}\n\n",
+            "---\n\n",
+        ]
+
+        # One section per result
+        for i, r in enumerate(results, 1):
+            parts.append(
+                f"## Result {i}: {r.key}\n\n**Response:**\n\n{r.value}\n\n---\n\n"
+            )
+
+        return "".join(parts)
+
 
 class PathValidator:
     """Utility class for validating and finding system paths."""
 
+    # Results depend only on the OS and install layout, so look them up once
     @staticmethod
+    @lru_cache(maxsize=1)
     def find_chrome_executable() -> Path:
         """
         Attempt to find Chrome executable on the system.
@@ -309,6 +509,7 @@ class PathValidator:
         )
 
     @staticmethod
+    @lru_cache(maxsize=1)
     def find_chrome_user_data() -> Path:
         """
         Attempt to find Chrome User Data directory.
@@ -390,9 +591,13 @@ class StatsCalculator:
         Returns:
             Dictionary with summary statistics
         """
-        total_completed = sum(s.tasks_completed for s in worker_stats)
-        total_failed = sum(s.tasks_failed for s in worker_stats)
-        total_time = sum(s.total_processing_time for s in worker_stats)
+        # Single pass over the workers for all three totals
+        total_completed = total_failed = 0
+        total_time = 0.0
+        for s in worker_stats:
+            total_completed += s.tasks_completed
+            total_failed += s.tasks_failed
+            total_time += s.total_processing_time
         total_tasks = total_completed + total_failed
 
         return {
@@ -422,9 +627,11 @@ async def load_prompts_from_text(filepath: str) -> List[Dict[str, str]]:
     return await PromptLoader.from_text_file(Path(filepath))
 
 
-async def export_results_json(results: List[Any], filepath: str) -> None:
+async def export_results_json(
+    results: List[Any], filepath: str, compress: Optional[str] = None
+) -> None:
     """Quick function to export results to JSON."""
-    await ResultExporter.to_json(results, Path(filepath))
+    await ResultExporter.to_json(results, Path(filepath), compress=compress)
 
 
 async def export_results_markdown(results: List[Any], filepath: str) -> None: